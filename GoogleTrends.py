@@ -1,15 +1,293 @@
 from pytrends.request import TrendReq
+from pytrends import exceptions
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import diskcache
+import requests
+import tenacity
 import pandas as pd
 import datetime as dt
+import copy
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# On-disk cache shared by all GoogleTrends instances, opened on first use (see configure_cache)
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'googletrends')
+CACHE_ENABLED = True
+_cache = None
+_cache_lock = threading.Lock()
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# Column names of the related topics/queries results
+RISING_TOPICS_COLUMNS = {'value': 'value_rising',
+			 'formattedValue': 'formattedValue_rising',
+			 'hasData': 'hasData_rising',
+			 'topic_title': 'topic_title_rising',
+			 'topic_type': 'topic_type_rising'}
+TOP_TOPICS_COLUMNS = {'value': 'value_top',
+		      'formattedValue': 'formattedValue_top',
+		      'hasData': 'hasData_top',
+		      'topic_title': 'topic_title_top',
+		      'topic_type': 'topic_type_top'}
+RISING_QUERIES_COLUMNS = {'query': 'rising_query', 'value': 'rising_value'}
+TOP_QUERIES_COLUMNS = {'query': 'top_query', 'value': 'top_value'}
+
+# Columns kept from the suggestions results ('mid' is left out)
+SUGGESTIONS_COLUMNS = ('title', 'type')
+
+def related_frames(entry, top_columns, rising_columns):
+	# Top and rising frames of a related topics/queries entry with their columns renamed in place.
+	# A missing (None) or empty frame is left out.
+	frames = []
+	for subkey, columns in (('top', top_columns), ('rising', rising_columns)):
+		df = entry.get(subkey)
+		if df is not None and not df.empty:
+			df.columns = [columns.get(col, col) for col in df.columns]
+			frames.append(df)
+	return frames
+
+def gather_results(futures):
+	# Waits for a dict of futures, a failed request gives None instead of failing the others
+	results = {}
+	for key, future in futures.items():
+		try:
+			results[key] = future.result()
+		except Exception:
+			logger.warning('Google trends request for %s failed', key, exc_info=True)
+			results[key] = None
+	return results
+
+def configure_cache(directory=None, enabled=True):
+	'''
+	Sets the directory of the on-disk cache and whether GoogleTrends methods use it at all.
+	An already open cache is closed, the next cached call opens the new one.
+	'''
+	global CACHE_DIR, CACHE_ENABLED, _cache
+	with _cache_lock:
+		if directory is not None:
+			CACHE_DIR = directory
+		CACHE_ENABLED = enabled
+		if _cache is not None:
+			_cache.close()
+			_cache = None
+
+def get_cache():
+	global _cache
+	with _cache_lock:
+		if _cache is None:
+			_cache = diskcache.Cache(CACHE_DIR)
+		return _cache
+
+def payload_params(trends):
+	# Instance parameters sent to Google with the payload (see GoogleTrends._ensurePayload)
+	return (
+		tuple(trends.keyword_list),
+		trends.timeframe,
+		trends.geo,
+		trends.category,
+		trends.gprop,
+		trends.host_language,
+		trends.pytrends.tz
+		)
+
+def cache_result(expire=DAY, params=payload_params, uses_timeframe=True):
+	'''
+	Caches the result of a GoogleTrends method on disk for `expire` seconds. Entries are keyed by
+	the method name, the instance parameters the method sends to Google (`params(self)`) and the
+	arguments of the call.
+	Results are pickled, so dataframes keep their dtypes. Empty results (None) are not cached.
+	For methods using the timeframe, relative timeframes move with the clock: 'now ...' results
+	are not cached and 'today ...' results are kept for an hour at most.
+	'''
+	def decorator(method):
+		signature = inspect.signature(method)
+
+		@functools.wraps(method)
+		def wrapper(self, *args, **kwargs):
+			ttl = expire
+			if uses_timeframe and str(self.timeframe).startswith('now'):
+				ttl = 0
+			elif uses_timeframe and str(self.timeframe).startswith('today'):
+				ttl = min(expire, HOUR)
+
+			if not CACHE_ENABLED or ttl <= 0:
+				return method(self, *args, **kwargs)
+
+			# Same entry however the arguments are passed, defaults included
+			call = signature.bind(self, *args, **kwargs)
+			call.apply_defaults()
+			arguments = tuple(call.arguments.items())[1:]
+
+			key = (method.__name__, *params(self), *arguments)
+
+			cache = get_cache()
+			result = cache.get(key)
+			if result is None:
+				result = method(self, *args, **kwargs)
+				if result is not None:
+					cache.set(key, result, expire=ttl)
+			return result
+		return wrapper
+	return decorator
+
+class MissingWeeksError(Exception):
+	'''Raised by historicalHourlyInterest when some weekly requests failed.'''
+
+	def __init__(self, timeframes):
+		super().__init__('No data for the weeks %s' % ', '.join(timeframes))
+		self.timeframes = timeframes
+
+class CircuitOpenError(Exception):
+	'''Raised instead of sending a request while Google is rate limiting us.'''
+
+class CircuitBreaker:
+	'''
+	Counts consecutive rate limited (429) requests. After fail_max of them, calls are rejected with
+	CircuitOpenError for reset_timeout seconds; the next call is then let through and another 429
+	opens the circuit again. Only the bookkeeping is done under the lock, the requests themselves
+	run concurrently.
+	'''
+
+	def __init__(self, fail_max=5, reset_timeout=60):
+		self.fail_max = fail_max
+		self.reset_timeout = reset_timeout
+		self._failures = 0
+		self._opened_at = None
+		self._lock = threading.Lock()
+
+	def _beforeCall(self):
+		with self._lock:
+			if self._opened_at is not None:
+				if time.monotonic() - self._opened_at < self.reset_timeout:
+					raise CircuitOpenError('Google is rate limiting, requests are paused')
+				# Half-open: let requests through, one more 429 opens the circuit again
+				self._opened_at = None
+				self._failures = self.fail_max - 1
+
+	def _success(self):
+		with self._lock:
+			self._failures = 0
+
+	def _failure(self):
+		with self._lock:
+			self._failures += 1
+			if self._failures >= self.fail_max:
+				self._opened_at = time.monotonic()
+
+	def __call__(self, func):
+		@functools.wraps(func)
+		def wrapper(*args, **kwargs):
+			self._beforeCall()
+			try:
+				result = func(*args, **kwargs)
+			except exceptions.TooManyRequestsError:
+				self._failure()
+				raise
+			self._success()
+			return result
+		return wrapper
+
+# Stops sending requests to Google for a minute after 5 consecutive rate limited (429) requests
+google_breaker = CircuitBreaker(fail_max=5, reset_timeout=60)
+
+class KeepAliveTrendReq(TrendReq):
+	'''
+	TrendReq keeping one requests.Session alive between requests. pytrends opens a new session,
+	and so a new TLS connection, for every request sent to Google; here the connections are kept
+	open and reused by all the requests (and copies) of this TrendReq.
+
+	Rate limited requests (429) are not retried by urllib3 but with a random exponential backoff,
+	and go through google_breaker so sweeps stop hammering Google while it is rate limiting.
+	'''
+
+	def __init__(self, *args, pool_maxsize=20, **kwargs):
+		super().__init__(*args, **kwargs)
+
+		retry = 0
+		if self.retries > 0 or self.backoff_factor > 0:
+			retry = Retry(
+				total = self.retries,
+				read = self.retries,
+				connect = self.retries,
+				backoff_factor = self.backoff_factor,
+				status_forcelist = [code for code in TrendReq.ERROR_CODES if code != requests.codes.too_many_requests],
+				allowed_methods = frozenset(['GET', 'POST'])
+				)
+
+		self.session = requests.Session()
+		self.session.headers.update(self.headers)
+		self.session.mount('https://', HTTPAdapter(pool_maxsize=pool_maxsize, max_retries=retry))
+
+	@tenacity.retry(
+		wait = tenacity.wait_random_exponential(multiplier=1, max=30),
+		stop = tenacity.stop_after_attempt(3),
+		retry = tenacity.retry_if_exception_type(exceptions.TooManyRequestsError),
+		reraise = True
+		)
+	@google_breaker
+	def _get_data(self, url, method=TrendReq.GET_METHOD, trim_chars=0, **kwargs):
+		proxies = None
+		if len(self.proxies) > 0:
+			self.cookies = self.GetGoogleCookie()
+			proxies = {'https': self.proxies[self.proxy_index]}
+
+		response = self.session.request(
+			method,
+			url,
+			timeout = self.timeout,
+			cookies = self.cookies,
+			proxies = proxies,
+			**kwargs,
+			**self.requests_args
+			)
+
+		# Google sends json as 'application/json', 'application/javascript' or 'text/javascript'
+		content_type = response.headers.get('Content-Type', '')
+		if response.status_code == 200 and ('json' in content_type or 'javascript' in content_type):
+			# some responses start with garbage characters, like ")]}',"
+			content = response.text[trim_chars:]
+			self.GetNewProxy()
+			return json.loads(content)
+		elif response.status_code == requests.codes.too_many_requests:
+			raise exceptions.TooManyRequestsError.from_response(response)
+		else:
+			raise exceptions.ResponseError.from_response(response)
 
-def check_if_valid_data(df: pd.DataFrame) -> bool:
-	# Check if dataframe is empty
-	if df.empty:
-		print('Google trends has returned no results.')
-		return False
-	# Validate
-	else:
-		return True
+	def clone(self):
+		'''
+		Shallow copy sharing the session, cookies and settings, with its own payload. pytrends
+		fills the widget lists in place when building a payload, so they can't be shared.
+		'''
+		trend_req = copy.copy(self)
+		trend_req.token_payload = {}
+		trend_req.interest_over_time_widget = {}
+		trend_req.interest_by_region_widget = {}
+		trend_req.related_topics_widget_list = []
+		trend_req.related_queries_widget_list = []
+		return trend_req
+
+@functools.lru_cache(maxsize=1)
+def _categories_cached(host_language):
+	# Google's category tree is static, fetch it once per process
+	pytrends = GoogleTrends._trendReq(host_language)
+	return pytrends.categories()
+
+@functools.lru_cache(maxsize=512)
+def _suggestions_cached(host_language, keyword):
+	# Suggestions only depend on the keyword and host language
+	pytrends = GoogleTrends._trendReq(host_language)
+	return tuple(pytrends.suggestions(keyword))
 
 class GoogleTrends:
 	'''
@@ -107,6 +385,34 @@ class GoogleTrends:
 		- Can be images, news, youtube or froogle (for Google Shopping results)
 	'''
 
+	# TrendReq settings, subclasses can override them, or _TREND_REQ_KWARGS as a whole
+	_TZ = 360
+	_RETRIES = 2
+	_TIMEOUT = (10,25)
+	_TREND_REQ_KWARGS = {'tz': _TZ, 'retries': _RETRIES, 'timeout': _TIMEOUT}
+
+	# One connection to Google per host language and settings, shared by all instances
+	_session_pool = {}
+	_session_pool_lock = threading.Lock()
+
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		if '_TREND_REQ_KWARGS' not in cls.__dict__:
+			cls._TREND_REQ_KWARGS = {'tz': cls._TZ, 'retries': cls._RETRIES, 'timeout': cls._TIMEOUT}
+
+	@classmethod
+	def _trendReq(cls, host_language):
+		'''
+		Returns a TrendReq for host_language. The Google cookie handshake is only done the first
+		time; afterwards a clone of the pooled TrendReq is returned, which shares its session and
+		cookies but has its own payload, so instances and threads don't overwrite each other's requests.
+		'''
+		key = (host_language, tuple(sorted(cls._TREND_REQ_KWARGS.items())))
+		with cls._session_pool_lock:
+			if key not in cls._session_pool:
+				cls._session_pool[key] = KeepAliveTrendReq(host_language, **cls._TREND_REQ_KWARGS)
+			return cls._session_pool[key].clone()
+
 	def __init__(self, keyword_list: list(), timeframe, geo, host_language, category=0, gprop=''):
 
 		self.keyword_list = keyword_list
@@ -115,17 +421,23 @@ class GoogleTrends:
 		self.host_language = host_language
 		self.gprop = gprop
 		self.category = category
-		self.pytrends = TrendReq(host_language, tz=360, retries=2, timeout=(10,25)) # Connect to Google
-
-		self.pytrends.build_payload(
-			kw_list = keyword_list,
-			cat = self.category,
-			timeframe = self.timeframe,
-			geo = self.geo,
-			gprop = self.gprop
-			)
-
-	def interestOverTime(self):
+		self.pytrends = self._trendReq(host_language) # Connect to Google
+		self._payload_built = False
+
+	def _ensurePayload(self):
+		# The payload costs a request to Google, only build it once a method needs it
+		if not self._payload_built:
+			self.pytrends.build_payload(
+				kw_list = self.keyword_list,
+				cat = self.category,
+				timeframe = self.timeframe,
+				geo = self.geo,
+				gprop = self.gprop
+				)
+			self._payload_built = True
+
+	@cache_result(expire=DAY)
+	def interestOverTime(self, return_view=False):
 		'''
 		Description:
 		------------
@@ -136,24 +448,118 @@ class GoogleTrends:
 		Parameters:
 		-----------
 		__init__
+		return_view: True returns pytrends' dataframe as is, indexed by datetime
 
 		Returns:
 		________
 		A dataframe with results by datetime.
+		Keyword columns are int8 (values 0 to 100): arithmetic on them wraps around silently,
+		e.g. 100 + 100 gives -56. Cast them first, e.g. df[kw_list].astype('int64').
 		'''
+		self._ensurePayload()
 		interest_over_time = self.pytrends.interest_over_time()
 
 		# data validation
-		val = check_if_valid_data(interest_over_time)
-		if val == True:
-			interest_df = interest_over_time.copy()
-			interest_df['datetime'] = interest_df.index.to_frame(index=True)
-			interest_df = interest_df.reset_index(drop=True)
-			return interest_df
-		else:
-			pass
+		if interest_over_time.empty:
+			logger.info('Google trends has returned no results.')
+			return None
+
+		# Values are scaled from 0 to 100, int8 is enough
+		interest_over_time = interest_over_time.astype({keyword: 'int8' for keyword in self.keyword_list})
+
+		if return_view:
+			return interest_over_time
+
+		interest_df = interest_over_time.reset_index().rename(columns={'date': 'datetime'})
+		return interest_df
 
-	def historicalHourlyInterest(self, start_date, end_date, hour_start=0, hour_end=1):
+	@cache_result(expire=DAY)
+	def interestOverTimeArrow(self):
+		'''
+		Description:
+		------------
+		Same data as interestOverTime, as a pyarrow Table built straight from Google's json response
+		(no pandas dataframe in between). The table is in long format, one row per datetime and keyword,
+		so it can be handed over to Parquet/Arrow/DuckDB without conversion.
+
+		Parameters:
+		-----------
+		__init__
+
+		Returns:
+		--------
+		A pyarrow Table with columns timestamp (UTC, seconds), keyword (dictionary encoded), value (int16).
+		'''
+		import pyarrow as pa
+
+		self._ensurePayload()
+		widget = self.pytrends.interest_over_time_widget
+		response = self.pytrends._get_data(
+			url = TrendReq.INTEREST_OVER_TIME_URL,
+			method = TrendReq.GET_METHOD,
+			trim_chars = 5,
+			params = {'req': json.dumps(widget['request']), 'token': widget['token'], 'tz': self.pytrends.tz}
+			)
+		timeline = response['default']['timelineData']
+
+		# data validation
+		if not timeline:
+			logger.info('Google trends has returned no results.')
+			return None
+
+		keyword_count = len(self.keyword_list)
+		timestamps = [int(point['time']) for point in timeline for _ in range(keyword_count)]
+		keyword_indices = list(range(keyword_count)) * len(timeline)
+		values = [value for point in timeline for value in point['value']]
+
+		return pa.table({
+			'timestamp': pa.array(timestamps, type=pa.timestamp('s', tz='UTC')),
+			'keyword': pa.DictionaryArray.from_arrays(pa.array(keyword_indices, type=pa.int8()), pa.array(self.keyword_list, type=pa.string())),
+			'value': pa.array(values, type=pa.int16())
+			})
+
+	@classmethod
+	def batchInterestOverTime(cls, keyword_lists, timeframe, geo, host_language, category=0, gprop='', max_workers=10):
+		'''
+		Description:
+		------------
+		Same as interestOverTime, for many keyword lists at once. Every keyword list gets its
+		own connection to Google and the requests are sent concurrently from a thread pool.
+
+		Parameters:
+		-----------
+		keyword_lists: list of kw_list, for example [['Pizza'], ['Pasta', 'Spaghetti']]
+		timeframe, geo, host_language, category, gprop: see __init__
+		max_workers: number of keyword lists requested at the same time
+
+		Returns:
+		--------
+		A dict {tuple(kw_list): dataframe with results by datetime}.
+		'''
+		def interest(keyword_list):
+			return cls(keyword_list, timeframe, geo, host_language, category, gprop).interestOverTime()
+
+		with ThreadPoolExecutor(max_workers=max_workers) as executor:
+			futures = {tuple(keyword_list): executor.submit(interest, keyword_list) for keyword_list in keyword_lists}
+
+			return gather_results(futures)
+
+	def _weeklyInterest(self, timeframe):
+		# pytrends keeps the payload on the TrendReq, each worker gets its own clone
+		# (the clones share the keep-alive requests.Session)
+		pytrends = self._trendReq(self.host_language)
+
+		pytrends.build_payload(
+			kw_list = self.keyword_list,
+			cat = self.category,
+			timeframe = timeframe,
+			geo = self.geo,
+			gprop = self.gprop
+			)
+
+		return pytrends.interest_over_time()
+
+	def historicalHourlyInterest(self, start_date, end_date, hour_start=0, hour_end=1, max_workers=20, jitter=0.5, return_view=False, strict=True):
 		'''
 		Description:
 		------------
@@ -161,7 +567,8 @@ class GoogleTrends:
 		to all searches. Returns historical, indexed, hourly data for when the keyword was
 		searched most as shown on Google Trends' Interest Over Time section. It sends multiple
 		requests to Google, each retrieving one week of hourly data. It seems like this would
-		be the only way to get historical, hourly data.
+		be the only way to get historical, hourly data. The weekly requests are sent
+		concurrently from a thread pool.
 
 		Parameters:
 		-----------
@@ -169,44 +576,67 @@ class GoogleTrends:
 		end_date = 'YYY-MM-DD'
 		hour_start
 		hour_end
+		max_workers: number of weekly requests sent at the same time
+		jitter: maximum random delay (in seconds) between two requests, to avoid Google's 429 errors
+		return_view: True returns the hourly dataframe as is, indexed by datetime
+		strict: True raises MissingWeeksError (with the failed timeframes) if any week failed,
+			False logs the failed weeks and returns the others
 
 		Returns:
 		________
 		A dataframe with results by hour.
+		Keyword columns are int8 (values 0 to 100): arithmetic on them wraps around silently,
+		e.g. 100 + 100 gives -56. Cast them first, e.g. df[kw_list].astype('int64').
 		'''
-		year_start, month_start, day_start = start_date.replace('-', ' ').strip().split()
-		year_end, month_end, day_end = end_date.replace('-', ' ').strip().split()
-
-		self.pytrends.get_historical_interest(
-			self.keyword_list,
-			year_start = int(year_start),
-			month_start = int(month_start),
-			day_start = int(day_start),
-			hour_start = int(hour_start),
-			year_end = int(year_end),
-			month_end = int(month_end),
-			day_end = int(day_end),
-			hour_end = int(hour_end),
-			cat = self.category,
-			geo = self.geo,
-			gprop = self.gprop,
-			sleep = 0
-			)
-
-		interest_over_time = self.pytrends.interest_over_time()
+		start = dt.datetime.strptime(start_date.strip(), '%Y-%m-%d').replace(hour=int(hour_start))
+		end = dt.datetime.strptime(end_date.strip(), '%Y-%m-%d').replace(hour=int(hour_end))
+
+		# One week of hourly data per request
+		timeframes = []
+		for week_start in pd.date_range(start, end, freq='7D'):
+			week_end = min(week_start + dt.timedelta(days=7), end)
+			if week_start < week_end:
+				timeframes.append(week_start.strftime('%Y-%m-%dT%H') + ' ' + week_end.strftime('%Y-%m-%dT%H'))
+
+		with ThreadPoolExecutor(max_workers=max_workers) as executor:
+			futures = {}
+			for timeframe in timeframes:
+				futures[timeframe] = executor.submit(self._weeklyInterest, timeframe)
+				time.sleep(random.uniform(0, jitter))
+
+			# A failed week is logged with its timeframe
+			weeks = gather_results(futures)
+
+		failed = [timeframe for timeframe, week in weeks.items() if week is None]
+		if failed and strict:
+			raise MissingWeeksError(failed)
+
+		weeks = [week for week in weeks.values() if week is not None and not week.empty]
+		if weeks:
+			interest_over_time = pd.concat(weeks).sort_index()
+			# Timeframes include both ends, consecutive weeks share their boundary hour
+			interest_over_time = interest_over_time[~interest_over_time.index.duplicated(keep='first')]
+			interest_over_time = interest_over_time.loc[start:end]
+		else:
+			interest_over_time = pd.DataFrame()
 
 		# data validation
-		val = check_if_valid_data(interest_over_time)
-		if val == True:
-			# Transform datetime index to column
-			historical_df = interest_over_time.copy()
-			historical_df['datetime'] = historical_df.index.to_frame(index=True)
-			historical_df = historical_df.reset_index(drop=True)
-			return historical_df
-		else:
-			pass
+		if interest_over_time.empty:
+			logger.info('Google trends has returned no results.')
+			return None
+
+		# Values are scaled from 0 to 100, int8 is enough
+		interest_over_time = interest_over_time.astype({keyword: 'int8' for keyword in self.keyword_list})
+
+		if return_view:
+			return interest_over_time
+
+		# Transform datetime index to column
+		historical_df = interest_over_time.reset_index().rename(columns={'date': 'datetime'})
+		return historical_df
 
-	def interestByRegion(self, region, inc_low_vol=False, inc_geo_code=True):
+	@cache_result(expire=DAY)
+	def interestByRegion(self, region, inc_low_vol=False, inc_geo_code=True, return_view=False):
 		'''
 		Description:
 		------------
@@ -225,11 +655,13 @@ class GoogleTrends:
 			'REGION' returns Region level data
         	inc_low_vol: True/False (includes google trends data for low volume countries/regions as well)
         	inc_geo_code: True/False (includes ISO codes of countries along with the names in the data)
+        	return_view: True returns pytrends' dataframe as is, indexed by geoName
 
 	        Returns:
         	--------
         	A dataframe with results by region.
 		'''
+		self._ensurePayload()
 		interest_by_region = self.pytrends.interest_by_region(
 			resolution = region,
 			inc_low_vol = inc_low_vol,
@@ -237,15 +669,49 @@ class GoogleTrends:
 			)
 
 		# data validation
-		val = check_if_valid_data(interest_by_region)
-		if val == True:
-			intByRegion_df = interest_by_region.copy()
-			intByRegion_df['geoName'] = intByRegion_df.index.to_frame(index=True)
-			intByRegion_df = intByRegion_df.reset_index(drop=True)
-			return intByRegion_df
-		else:
-			pass
+		if interest_by_region.empty:
+			logger.info('Google trends has returned no results.')
+			return None
+
+		if return_view:
+			return interest_by_region
+
+		intByRegion_df = interest_by_region.reset_index()
+		return intByRegion_df
+
+	def _regionInterest(self, region, inc_low_vol, inc_geo_code):
+		# interest_by_region edits the region widget in place, each worker gets its own copy
+		trends = copy.copy(self)
+		trends.pytrends = copy.copy(self.pytrends)
+		trends.pytrends.interest_by_region_widget = copy.deepcopy(self.pytrends.interest_by_region_widget)
+		return trends.interestByRegion(region, inc_low_vol=inc_low_vol, inc_geo_code=inc_geo_code)
+
+	def interestByRegions(self, regions, inc_low_vol=False, inc_geo_code=True):
+		'''
+		Description:
+		------------
+		Same as interestByRegion, for several resolutions at once. The requests are sent
+		concurrently from a thread pool.
+
+		Parameters:
+		-----------
+		regions: list of resolutions, for example ['CITY', 'REGION', 'COUNTRY']
+		inc_low_vol: True/False (includes google trends data for low volume countries/regions as well)
+		inc_geo_code: True/False (includes ISO codes of countries along with the names in the data)
+
+		Returns:
+		--------
+		A dict {region: dataframe with results by region}.
+		'''
+		# Built once here, the workers copy it
+		self._ensurePayload()
+
+		with ThreadPoolExecutor(max_workers=max(1, len(regions))) as executor:
+			futures = {region: executor.submit(self._regionInterest, region, inc_low_vol, inc_geo_code) for region in regions}
 
+			return gather_results(futures)
+
+	@cache_result(expire=DAY)
 	def relatedTopics(self):
 		'''
 		Description:
@@ -263,30 +729,22 @@ class GoogleTrends:
         	A dataframe of related_topics information. Specifically, the dataframe contains a
         	its columns related to the subkeys (‘rising’ and ‘top’).
 		'''
+		self._ensurePayload()
 		related_topics = self.pytrends.related_topics()
 
-		# getting Rising & Top topics from results
-		rising_df = related_topics[self.keyword_list[0]]['rising']
-		top_df = related_topics[self.keyword_list[0]]['top']
-		try:
-			# Renaming columns
-			rising_df = rising_df.rename(columns={'value': 'value_rising',
-							      'formattedValue': 'formattedValue_rising',
-							      'hasData': 'hasData_rising',
-							      'topic_title': 'topic_title_rising',
-							      'topic_type': 'topic_type_rising'})
-			top_df = top_df.rename(columns={'value': 'value_top',
-							'formattedValue': 'formattedValue_top',
-							'hasData': 'hasData_top',
-							'topic_title': 'topic_title_top',
-							'topic_type': 'topic_type_top'})
-			# Concatenate top and rising dataframes
-			df = pd.concat([top_df, rising_df], axis=1)
-			df = df.drop(['link', 'topic_mid'], axis=1)
-			return df
-		except:
-			print('No results for Related topics')
+		# getting Rising & Top topics from results, low volume keywords often only have one of them
+		entry = related_topics.get(self.keyword_list[0]) or {}
+		frames = related_frames(entry, TOP_TOPICS_COLUMNS, RISING_TOPICS_COLUMNS)
+		if not frames:
+			logger.info('No results for Related topics')
+			return None
 
+		# Concatenate top and rising dataframes
+		df = pd.concat(frames, axis=1, copy=False)
+		df.drop(columns=['link', 'topic_mid'], inplace=True, errors='ignore')
+		return df
+
+	@cache_result(expire=DAY)
 	def relatedQueries(self, category=0):
 		'''
 		Description:
@@ -305,20 +763,20 @@ class GoogleTrends:
 		A dataframe of related_queries information. Specifically, the dataframe contains a
         	its columns related to the subkeys (‘rising’ and ‘top’).
 		'''
+		self._ensurePayload()
 		related_queries = self.pytrends.related_queries()
 
-		rising_df = related_queries[self.keyword_list[0]]['rising']
-		top_df = related_queries[self.keyword_list[0]]['top']
-		try:
-			# Renaming columns
-			rising_df = rising_df.rename(columns={'query': 'rising_query', 'value': 'rising_value'})
-			top_df = top_df.rename(columns={'query': 'top_query', 'value': 'top_value'})
-			# Concatenate top and rising dataframes
-			df = pd.concat([top_df, rising_df], axis=1)
-			return df
-		except:
-			print('No results for Related queries')
+		entry = related_queries.get(self.keyword_list[0]) or {}
+		frames = related_frames(entry, TOP_QUERIES_COLUMNS, RISING_QUERIES_COLUMNS)
+		if not frames:
+			logger.info('No results for Related queries')
+			return None
 
+		# Concatenate top and rising dataframes
+		df = pd.concat(frames, axis=1, copy=False)
+		return df
+
+	@cache_result(expire=HOUR, params=lambda trends: (trends.host_language,), uses_timeframe=False)
 	def trendingSearches(self, country):
 		'''
 		Description:
@@ -337,12 +795,38 @@ class GoogleTrends:
 		trending_searches_df = self.pytrends.trending_searches(pn = country)
 
 		# data validation
-		val = check_if_valid_data(trending_searches_df)
-		if val == True:
-			return trending_searches_df
-		else:
-			pass
+		if trending_searches_df.empty:
+			logger.info('Google trends has returned no results.')
+			return None
 
+		return trending_searches_df
+
+	def _countryTrendingSearches(self, country):
+		# Each worker gets its own TrendReq, a pytrends session is not thread-safe
+		trends = copy.copy(self)
+		trends.pytrends = self._trendReq(self.host_language)
+		return trends.trendingSearches(country)
+
+	def trendingSearchesBulk(self, countries):
+		'''
+		Description:
+		------------
+		Same as trendingSearches, for several countries at once. The requests are sent
+		concurrently from a thread pool.
+
+		Parameters:
+		-----------
+		countries: list of lowercase strings, for example ['united_states', 'brazil']
+
+		Returns:
+		--------
+		A dict {country: dataframe}.
+		'''
+		with ThreadPoolExecutor(max_workers=max(1, min(16, len(countries)))) as executor:
+			futures = {country: executor.submit(self._countryTrendingSearches, country) for country in countries}
+			return gather_results(futures)
+
+	@cache_result(expire=DAY, params=lambda trends: (trends.geo, trends.host_language, trends.pytrends.tz), uses_timeframe=False)
 	def topCharts(self, year):
 		'''
 		Description:
@@ -361,12 +845,13 @@ class GoogleTrends:
 		top_charts_df = self.pytrends.top_charts(year, geo = self.geo)
 
 		# data validation
-		val = check_if_valid_data(top_charts_df)
-		if val == True:
-			return top_charts_df
-		else:
-			pass
+		if top_charts_df is None or top_charts_df.empty:
+			logger.info('Google trends has returned no results.')
+			return None
 
+		return top_charts_df
+
+	@cache_result(expire=DAY, params=lambda trends: (trends.keyword_list[0], trends.host_language), uses_timeframe=False)
 	def suggestions(self):
 		'''
 		Description:
@@ -382,17 +867,18 @@ class GoogleTrends:
 		--------
 		A dataframe.
 		'''
-		suggestions = self.pytrends.suggestions(self.keyword_list[0])
-		suggestions_df = pd.DataFrame.from_dict(suggestions).drop('mid', axis=1)
+		suggestions = _suggestions_cached(self.host_language, self.keyword_list[0])
+		suggestions_df = pd.DataFrame({col: [suggestion.get(col) for suggestion in suggestions] for col in SUGGESTIONS_COLUMNS})
 
 		# data validation
-		val = check_if_valid_data(suggestions_df)
-		if val == True:
-			return suggestions_df
-		else:
-			pass
+		if suggestions_df.empty:
+			logger.info('Google trends has returned no results.')
+			return None
+
+		return suggestions_df
 
 	def categories(self):
 
-		res = self.pytrends.categories()
+		# Copy, so callers can't modify the cached categories
+		res = copy.deepcopy(_categories_cached(self.host_language))
 		return res
@@ -0,0 +1,149 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+try:
+	import GoogleTrends as gt
+	import pandas as pd
+except ImportError as e:
+	raise unittest.SkipTest('GoogleTrends dependencies are not installed: %s' % e)
+
+
+def make_trend_req():
+	# No cookie handshake with Google
+	with mock.patch.object(gt.TrendReq, 'GetGoogleCookie', return_value={}):
+		return gt.KeepAliveTrendReq('en-US', tz=360, retries=2, timeout=(10,25))
+
+def json_response():
+	response = mock.Mock(status_code=200, headers={'Content-Type': 'application/json'}, text='{}')
+	return response
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+	def test_requests_run_concurrently(self):
+		trend_req = make_trend_req()
+
+		def slow_request(*args, **kwargs):
+			time.sleep(0.5)
+			return json_response()
+
+		with mock.patch.object(trend_req.session, 'request', side_effect=slow_request):
+			threads = [threading.Thread(target=trend_req._get_data, args=('https://trends.google.com',)) for _ in range(4)]
+			start = time.monotonic()
+			for thread in threads:
+				thread.start()
+			for thread in threads:
+				thread.join()
+			elapsed = time.monotonic() - start
+
+		self.assertLess(elapsed, 1.5)
+
+	def test_opens_after_consecutive_rate_limits(self):
+		breaker = gt.CircuitBreaker(fail_max=2, reset_timeout=60)
+		calls = []
+
+		@breaker
+		def rate_limited():
+			calls.append(1)
+			raise gt.exceptions.TooManyRequestsError('429', mock.Mock())
+
+		for _ in range(2):
+			with self.assertRaises(gt.exceptions.TooManyRequestsError):
+				rate_limited()
+		with self.assertRaises(gt.CircuitOpenError):
+			rate_limited()
+		self.assertEqual(len(calls), 2)
+
+
+class TestSessionPool(unittest.TestCase):
+
+	def test_clones_do_not_share_payload(self):
+		trend_req = make_trend_req()
+		clone = trend_req.clone()
+		clone.related_queries_widget_list.append({'token': 'pizza'})
+
+		self.assertEqual(trend_req.related_queries_widget_list, [])
+		self.assertIs(clone.session, trend_req.session)
+
+
+class TestTrendReqSettings(unittest.TestCase):
+
+	def test_subclass_settings(self):
+		class NoTimezone(gt.GoogleTrends):
+			_TZ = 0
+
+		class Backoff(gt.GoogleTrends):
+			_TREND_REQ_KWARGS = {'tz': 0, 'retries': 2, 'timeout': (10,25), 'backoff_factor': 0.5}
+
+		self.assertEqual(NoTimezone._TREND_REQ_KWARGS, {'tz': 0, 'retries': 2, 'timeout': (10,25)})
+		self.assertEqual(Backoff._TREND_REQ_KWARGS['backoff_factor'], 0.5)
+
+
+def make_trends(keyword_list):
+	# GoogleTrends on a mocked TrendReq, with the payload considered built
+	with mock.patch.object(gt.GoogleTrends, '_trendReq', return_value=mock.Mock(tz=360)):
+		trends = gt.GoogleTrends(keyword_list, 'today 5-y', 'US', 'en-US')
+	trends._payload_built = True
+	return trends
+
+def topics_frame():
+	return pd.DataFrame({'value': [100], 'formattedValue': ['100'], 'hasData': [True], 'link': ['/x'],
+			     'topic_mid': ['/m/0'], 'topic_title': ['Pizza'], 'topic_type': ['Dish']})
+
+
+class TestRelated(unittest.TestCase):
+
+	def setUp(self):
+		gt.configure_cache(enabled=False)
+
+	def tearDown(self):
+		gt.configure_cache(enabled=True)
+
+	def test_topics_top_only(self):
+		trends = make_trends(['pizza'])
+		trends.pytrends.related_topics.return_value = {'pizza': {'top': topics_frame(), 'rising': pd.DataFrame()}}
+
+		df = trends.relatedTopics()
+
+		self.assertEqual(len(df), 1)
+		self.assertIn('topic_title_top', df.columns)
+		self.assertNotIn('link', df.columns)
+
+	def test_topics_rising_only(self):
+		trends = make_trends(['pizza'])
+		trends.pytrends.related_topics.return_value = {'pizza': {'top': pd.DataFrame(), 'rising': topics_frame()}}
+
+		df = trends.relatedTopics()
+
+		self.assertEqual(len(df), 1)
+		self.assertIn('topic_title_rising', df.columns)
+
+	def test_topics_no_results(self):
+		trends = make_trends(['pizza'])
+		trends.pytrends.related_topics.return_value = {'pizza': {'top': pd.DataFrame(), 'rising': pd.DataFrame()}}
+
+		self.assertIsNone(trends.relatedTopics())
+
+	def test_queries_top_only(self):
+		trends = make_trends(['pizza'])
+		top = pd.DataFrame({'query': ['pizza hut'], 'value': [100]})
+		trends.pytrends.related_queries.return_value = {'pizza': {'top': top, 'rising': None}}
+
+		df = trends.relatedQueries()
+
+		self.assertEqual(list(df.columns), ['top_query', 'top_value'])
+
+	def test_queries_rising_only(self):
+		trends = make_trends(['pizza'])
+		rising = pd.DataFrame({'query': ['pizza near me'], 'value': [250]})
+		trends.pytrends.related_queries.return_value = {'pizza': {'top': None, 'rising': rising}}
+
+		df = trends.relatedQueries()
+
+		self.assertEqual(list(df.columns), ['rising_query', 'rising_value'])
+
+
+if __name__ == '__main__':
+	unittest.main()